@@ -3,6 +3,7 @@ __all__ = [
     "telemetry",
     "rpc",
     "scenarios",
+    "pacing",
     "cli",
 ]
 
@@ -0,0 +1,19 @@
+from __future__ import annotations
+
+# numba is an optional accelerator: without it the decorated functions run as
+# plain Python. Set NUMBA_DISABLE_JIT=1 to force the interpreted path (e.g. for
+# debugging or coverage) even when numba is installed.
+try:
+    from numba import njit
+except ImportError:  # pragma: no cover - depends on the environment
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+
+        def decorator(fn):
+            return fn
+
+        return decorator
+
+
+__all__ = ["njit"]
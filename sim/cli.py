@@ -1,20 +1,142 @@
 from __future__ import annotations
 
 import argparse
+import math
 import os
 import sys
 import time
-from typing import Optional
+from typing import Callable, Dict, Optional, Tuple
 
 import matplotlib
 matplotlib.use("Agg")
-import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
 
-from .physics import SimpleAircraft2D, ControlInput, Environment, initial_state
-from .telemetry import TelemetryConfig, TelemetryRecorder, compare_csvs
-from .rpc import RpcConfig, UdpServer, UdpClient
+from .physics import AircraftState, SimpleAircraft2D, initial_state
+from .telemetry import TELEMETRY_COLUMNS, TelemetryConfig, TelemetryRecorder, compare_csvs
+from .pacing import Pacer
+from .rpc import DirectChannel, ManualClock, RpcConfig, UdpServer, UdpClient
 from . import scenarios as scenarios_mod
 
+ControlFn = Callable[[float], Tuple[float, float, float]]
+ScheduleFn = Callable[[np.ndarray], Tuple[np.ndarray, np.ndarray, np.ndarray]]
+
+
+# One figure reused by every run in the process: it is cleared and its axes
+# rebuilt rather than paying figure/renderer setup per run
+_FIG = None
+_AX = None
+
+
+def _plot_telemetry(df: pd.DataFrame, out_png: str) -> None:
+    global _FIG, _AX
+    # pyplot is imported lazily: its font-manager startup is wasted on plot-less runs
+    import matplotlib.pyplot as plt
+
+    if _FIG is None:
+        _FIG, _AX = plt.subplots(2, 1, figsize=(8, 6), sharex=True)
+    else:
+        # clear() also drops the subplot positions tight_layout() set last time;
+        # clearing only the axes would lay out from those and shift the margins
+        _FIG.clear()
+        _AX = _FIG.subplots(2, 1, sharex=True)
+    _AX[0].plot(df["time_s"], df["pos_y_m"], label="Altitude (m)")
+    _AX[0].legend()
+    _AX[1].plot(df["time_s"], df["vel_x_mps"], label="Vx (m/s)")
+    _AX[1].legend()
+    _AX[1].set_xlabel("Time (s)")
+    _FIG.tight_layout()
+    _FIG.savefig(out_png)
+
+
+def _run_with_link(
+    sim: SimpleAircraft2D,
+    state: AircraftState,
+    control_fn: ControlFn,
+    schedule_fn: Optional[ScheduleFn],
+    hz: int,
+    steps: int,
+    seed: int,
+    loss_p: float,
+    latency_ms: int,
+    realtime: bool,
+) -> Dict[str, np.ndarray]:
+    """Drive the scenario through the control link; returns telemetry columns."""
+    dt_s = 1.0 / float(hz)
+
+    # RPC server/client. Without real-time pacing, the RPC clock counts ticks and
+    # latency is rounded up to whole ticks, so network effects do not depend on
+    # host speed or on float rounding of tick times.
+    sim_clock = None if realtime else ManualClock()
+    # Everything that can fail after the link is up sits inside try/finally, so the
+    # RX thread and sockets are always released
+    server = None
+    client = None
+    try:
+        if loss_p == 0.0 and latency_ms == 0:
+            # Ideal link: nothing to emulate, so skip the UDP round trip entirely
+            server = client = DirectChannel()
+        else:
+            server = UdpServer(
+                RpcConfig(loss_p=loss_p, latency_ms=latency_ms, rand_seed=seed),
+                clock=time.monotonic if sim_clock is None else sim_clock,
+                latency=None if sim_clock is None else math.ceil(latency_ms / 1000.0 / dt_s - 1e-9),
+            )
+            server.start()
+            client = UdpClient(server.address)
+
+        t_s = np.arange(steps) * dt_s
+        if schedule_fn is not None:
+            cmd_thrust, cmd_pitch, wind_x = schedule_fn(t_s)
+        else:
+            cmds = np.array([control_fn(t) for t in t_s], dtype=np.float64).reshape(steps, 3)
+            cmd_thrust, cmd_pitch, wind_x = cmds[:, 0], cmds[:, 1], cmds[:, 2]
+
+        # Controls are open-loop, so only the RPC link needs to run tick by tick;
+        # physics integrates the applied commands afterwards in one pass.
+        applied_thrust = np.empty(steps)
+        applied_pitch = np.empty(steps)
+        pacer = Pacer(hz) if realtime else None
+        last_applied_thrust = 0.0
+        last_applied_pitch = 0.0
+        for i in range(steps):
+            if sim_clock is not None:
+                sim_clock.now = float(i)
+            client.send(cmd_thrust[i], cmd_pitch[i])
+            # Never hold a command past its tick, whatever the client's batch size
+            client.flush()
+            if sim_clock is not None:
+                # Let the RX thread catch up so fast runs stay deterministic
+                if not server.wait_received(client.sent):
+                    raise RuntimeError(f"RPC receiver did not take tick {i}'s command off the socket")
+            # Poll any available command to apply (respecting latency inside server)
+            msg = server.poll_next()
+            if msg is not None:
+                last_applied_thrust = float(msg.get("thrust_01", last_applied_thrust))
+                last_applied_pitch = float(msg.get("pitch_deg", last_applied_pitch))
+            applied_thrust[i] = last_applied_thrust
+            applied_pitch[i] = last_applied_pitch
+            # Pace to real time
+            if pacer is not None:
+                pacer.wait()
+    finally:
+        if server is not None:
+            server.stop()
+        if client is not None:
+            client.close()
+
+    time_out, pos_x, pos_y, vel_x, vel_y = sim.simulate(state, applied_thrust, applied_pitch, wind_x, dt_s)
+    return {
+        "time_s": time_out,
+        "pos_x_m": pos_x,
+        "pos_y_m": pos_y,
+        "vel_x_mps": vel_x,
+        "vel_y_mps": vel_y,
+        "thrust_01": applied_thrust,
+        "pitch_deg": applied_pitch,
+        "wind_x_mps": wind_x,
+    }
+
 
 def run_sim(
     scenario: str,
@@ -25,93 +147,57 @@ def run_sim(
     latency_ms: int,
     golden: Optional[str],
     out_csv: str,
+    realtime: bool = True,
+    plot: bool = True,
 ) -> int:
     sim = SimpleAircraft2D()
     state = initial_state()
 
-    # Scenario control function
+    # Scenario control schedule (vectorized where the scenario allows it), plus a
+    # fused whole-run kernel for schedules that have one
+    schedule_fn = None
+    fused_run = None
     if scenario == "takeoff_landing":
         control_fn = scenarios_mod.takeoff_landing(seed=seed, wind=0.0)
+        schedule_fn = lambda t: scenarios_mod.takeoff_landing_vectorized(t, wind=0.0)
+        fused_run = lambda n, dt: scenarios_mod.takeoff_landing_run(sim, state, n, dt, wind=0.0)
         gps_jitter_std = 0.0
     elif scenario == "wind_gusts":
         control_fn = scenarios_mod.wind_gusts(seed=seed, gust_std=2.0)
         gps_jitter_std = 0.0
     elif scenario == "gps_jitter":
         control_fn = scenarios_mod.takeoff_landing(seed=seed, wind=0.0)
+        schedule_fn = lambda t: scenarios_mod.takeoff_landing_vectorized(t, wind=0.0)
+        fused_run = lambda n, dt: scenarios_mod.takeoff_landing_run(sim, state, n, dt, wind=0.0)
         gps_jitter_std = scenarios_mod.gps_jitter(seed=seed, std=1.5)
     else:
         print(f"Unknown scenario: {scenario}")
         return 2
 
-    # Telemetry
-    tel = TelemetryRecorder(TelemetryConfig(hz=hz, gps_jitter_std_m=gps_jitter_std, rng_seed=seed))
-
-    # RPC server/client
-    server = UdpServer(RpcConfig(loss_p=loss_p, latency_ms=latency_ms, rand_seed=seed))
-    server.start()
-    client = UdpClient(server.address)
-
     dt_s = 1.0 / float(hz)
     steps = int(round(duration_s / dt_s))
-    t0 = time.monotonic()
-    last_applied_thrust = 0.0
-    last_applied_pitch = 0.0
-    for i in range(steps):
-        t = i * dt_s
-        thrust, pitch, wind = control_fn(t)
-        client.send(thrust, pitch)
-        # Poll any available command to apply (respecting latency inside server)
-        msg = server.poll_next()
-        if msg is None:
-            applied_thrust = last_applied_thrust
-            applied_pitch = last_applied_pitch
-        else:
-            applied_thrust = float(msg.get("thrust_01", last_applied_thrust))
-            applied_pitch = float(msg.get("pitch_deg", last_applied_pitch))
-        last_applied_thrust = applied_thrust
-        last_applied_pitch = applied_pitch
-
-        state = sim.step(
-            state,
-            ControlInput(thrust_01=applied_thrust, pitch_deg=applied_pitch),
-            Environment(wind_x_mps=float(wind)),
-            dt_s,
-        )
-        tel.record(
-            {
-                "time_s": state.time_s,
-                "pos_x_m": state.pos_x_m,
-                "pos_y_m": state.pos_y_m,
-                "vel_x_mps": state.vel_x_mps,
-                "vel_y_mps": state.vel_y_mps,
-                "thrust_01": applied_thrust,
-                "pitch_deg": applied_pitch,
-                "wind_x_mps": float(wind),
-            }
+
+    # Telemetry
+    tel = TelemetryRecorder(TelemetryConfig(hz=hz, gps_jitter_std_m=gps_jitter_std, rng_seed=seed), capacity=steps)
+
+    if fused_run is not None and loss_p == 0.0 and latency_ms == 0 and not realtime:
+        # Nothing to emulate or pace: schedule, physics and recording run as one compiled loop
+        tel.record_columns(dict(zip(TELEMETRY_COLUMNS, fused_run(steps, dt_s).T)))
+    else:
+        tel.record_columns(
+            _run_with_link(sim, state, control_fn, schedule_fn, hz, steps, seed, loss_p, latency_ms, realtime)
         )
-        # Pace roughly real-time if possible (best-effort)
-        target = t0 + (i + 1) * dt_s
-        now = time.monotonic()
-        if target > now:
-            time.sleep(min(0.005, target - now))
 
     # Save outputs
     tel.save_csv(out_csv)
     # Plot
-    df = tel.to_dataframe()
-    os.makedirs("plots", exist_ok=True)
-    base = os.path.splitext(os.path.basename(out_csv))[0]
-    out_png = os.path.join("plots", f"{base}.png")
-    if not df.empty:
-        fig, ax = plt.subplots(2, 1, figsize=(8, 6), sharex=True)
-        ax[0].plot(df["time_s"], df["pos_y_m"], label="Altitude (m)")
-        ax[0].legend()
-        ax[1].plot(df["time_s"], df["vel_x_mps"], label="Vx (m/s)")
-        ax[1].legend()
-        ax[1].set_xlabel("Time (s)")
-        fig.tight_layout()
-        fig.savefig(out_png)
-        plt.close(fig)
+    if plot:
+        df = tel.to_dataframe()
+        os.makedirs("plots", exist_ok=True)
+        base = os.path.splitext(os.path.basename(out_csv))[0]
+        out_png = os.path.join("plots", f"{base}.png")
+        if not df.empty:
+            _plot_telemetry(df, out_png)
 
     # Compare goldens
     if golden:
@@ -137,6 +223,8 @@ def parse_args(argv: Optional[list[str]] = None) -> argparse.Namespace:
     p.add_argument("--latency-ms", type=int, default=0)
     p.add_argument("--golden", type=str, default="")
     p.add_argument("--out", type=str, required=True)
+    p.add_argument("--realtime", action=argparse.BooleanOptionalAction, default=True)
+    p.add_argument("--plot", action=argparse.BooleanOptionalAction, default=True)
     return p.parse_args(argv)
 
 
@@ -151,6 +239,8 @@ def main(argv: Optional[list[str]] = None) -> int:
         latency_ms=args.latency_ms,
         golden=args.golden or None,
         out_csv=args.out,
+        realtime=args.realtime,
+        plot=args.plot,
     )
 
 
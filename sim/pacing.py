@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+import time
+
+
+class Pacer:
+    """Hold a loop to a fixed rate against absolute deadlines.
+
+    Sleeps through most of each gap, then spins on perf_counter_ns for the last
+    stretch so a tick ends within microseconds of its deadline instead of at the
+    mercy of time.sleep granularity. Deadlines advance by whole periods, so drift
+    does not accumulate; if the loop overruns, the missed frames are skipped.
+    """
+
+    def __init__(self, hz: float, spin_s: float = 100e-6, min_sleep_s: float = 200e-6) -> None:
+        self.period_ns = int(round(1e9 / float(hz)))
+        self.spin_ns = int(spin_s * 1e9)
+        self.min_sleep_ns = int(min_sleep_s * 1e9)
+        self._next = time.perf_counter_ns() + self.period_ns
+
+    def wait(self) -> int:
+        """Block until the next tick deadline; returns how many frames were skipped."""
+        remaining = self._next - time.perf_counter_ns()
+        if remaining > self.min_sleep_ns:
+            time.sleep((remaining - self.spin_ns) * 1e-9)
+        while time.perf_counter_ns() < self._next:
+            pass
+        self._next += self.period_ns
+        skipped = 0
+        now = time.perf_counter_ns()
+        if now >= self._next:
+            # Overran by a full period or more: drop the missed frames
+            skipped = (now - self._next) // self.period_ns + 1
+            self._next += skipped * self.period_ns
+        return skipped
@@ -4,8 +4,12 @@ from dataclasses import dataclass
 from typing import Tuple
 import math
 
+import numpy as np
 
-@dataclass
+from ._jit import njit
+
+
+@dataclass(slots=True)
 class AircraftState:
     time_s: float
     pos_x_m: float
@@ -15,17 +19,154 @@ class AircraftState:
     pitch_deg: float
 
 
-@dataclass
+@dataclass(slots=True)
 class ControlInput:
     thrust_01: float  # 0..1 throttle
     pitch_deg: float  # nose up positive
 
 
-@dataclass
+@dataclass(slots=True)
 class Environment:
     wind_x_mps: float = 0.0
 
 
+# pitch_deg -> (sin, cos). Scenario schedules only use a handful of distinct
+# pitch angles, so step() almost always hits this instead of calling trig.
+_pitch_trig_cache: dict[float, Tuple[float, float]] = {}
+_PITCH_TRIG_CACHE_MAX = 256
+
+
+def _pitch_trig(pitch_deg: float) -> Tuple[float, float]:
+    trig = _pitch_trig_cache.get(pitch_deg)
+    if trig is None:
+        if len(_pitch_trig_cache) >= _PITCH_TRIG_CACHE_MAX:
+            _pitch_trig_cache.clear()
+        pitch_rad = math.radians(pitch_deg)
+        trig = _pitch_trig_cache[pitch_deg] = (math.sin(pitch_rad), math.cos(pitch_rad))
+    return trig
+
+
+@njit(cache=True, fastmath=True)
+def _step_core(
+    time_s: float,
+    px: float,
+    py: float,
+    vx: float,
+    vy: float,
+    thrust01: float,
+    sin_pitch: float,
+    cos_pitch: float,
+    wind: float,
+    dt: float,
+    mass: float,
+    max_thr: float,
+    rho: float,
+    cd: float,
+    area: float,
+    lift_k: float,
+    g: float,
+    vdamp: float,
+) -> Tuple[float, float, float, float, float]:
+    # Scalar physics kernel: plain floats in, (time, x, y, vx, vy) out so it
+    # can be JIT-compiled. AircraftState boxing stays in SimpleAircraft2D.step.
+    # Pitch arrives as (sin, cos) so callers can reuse them across ticks.
+    # Clamp inputs
+    thrust = max(0.0, min(1.0, thrust01))
+
+    # Thrust components (acceleration per mass); both are zero at idle
+    thrust_ax = 0.0
+    thrust_ay = 0.0
+    if thrust > 0.0:
+        thrust_ax = max_thr * thrust * cos_pitch
+        thrust_ay = max_thr * thrust * sin_pitch
+
+    # Air-relative velocity
+    rel_vx = vx - wind
+    rel_vy = vy
+    speed = math.hypot(rel_vx, rel_vy)
+
+    # Drag: D = 0.5 * rho * Cd * A * v^2, direction opposite airspeed
+    if speed > 0.0:
+        drag_acc_mag = 0.5 * rho * cd * area * (speed * speed) / mass
+        drag_acc_mag = min(drag_acc_mag, 50.0)
+        ux = rel_vx / speed
+        uy = rel_vy / speed
+        drag_ax = -drag_acc_mag * ux
+        drag_ay = -drag_acc_mag * uy
+    else:
+        drag_ax = 0.0
+        drag_ay = 0.0
+
+    # Lift: L = kL * v^2 * max(sin(alpha), 0) upward only (alpha ≈ pitch)
+    lift_acc = lift_k * (speed * speed) * max(sin_pitch, 0.0)
+    lift_acc = min(lift_acc, 20.0)
+    lift_ax = 0.0
+    lift_ay = lift_acc
+
+    # Gravity
+    grav_ax = 0.0
+    grav_ay = -g
+
+    # Net acceleration
+    ax = thrust_ax + drag_ax + lift_ax + grav_ax
+    # Simple vertical damping to bleed climb/descent energy in the toy model
+    damping_ay = -vdamp * vy
+    ay = thrust_ay + drag_ay + lift_ay + grav_ay + damping_ay
+
+    # Integrate (explicit Euler)
+    new_vx = vx + ax * dt
+    new_vy = vy + ay * dt
+    # Cap speeds to avoid numerical blow-up in toy model
+    new_vx = max(-300.0, min(300.0, new_vx))
+    new_vy = max(-300.0, min(300.0, new_vy))
+    new_x = px + vx * dt
+    new_y = max(0.0, py + vy * dt)
+
+    return time_s + dt, new_x, new_y, new_vx, new_vy
+
+
+@njit(cache=True, fastmath=True)
+def _simulate_core(
+    thrust01: np.ndarray,
+    sin_pitch: np.ndarray,
+    cos_pitch: np.ndarray,
+    wind: np.ndarray,
+    time_s: float,
+    px: float,
+    py: float,
+    vx: float,
+    vy: float,
+    dt: float,
+    mass: float,
+    max_thr: float,
+    rho: float,
+    cd: float,
+    area: float,
+    lift_k: float,
+    g: float,
+    vdamp: float,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    # Run _step_core over whole control arrays in one compiled loop; row i holds
+    # the state after applying control i.
+    n = thrust01.shape[0]
+    out_t = np.empty(n)
+    out_x = np.empty(n)
+    out_y = np.empty(n)
+    out_vx = np.empty(n)
+    out_vy = np.empty(n)
+    for i in range(n):
+        time_s, px, py, vx, vy = _step_core(
+            time_s, px, py, vx, vy, thrust01[i], sin_pitch[i], cos_pitch[i], wind[i], dt,
+            mass, max_thr, rho, cd, area, lift_k, g, vdamp,
+        )
+        out_t[i] = time_s
+        out_x[i] = px
+        out_y[i] = py
+        out_vx[i] = vx
+        out_vy[i] = vy
+    return out_t, out_x, out_y, out_vx, out_vy
+
+
 class SimpleAircraft2D:
     def __init__(
         self,
@@ -47,6 +188,18 @@ class SimpleAircraft2D:
         self.gravity_mps2 = gravity_mps2
         self.vertical_damping_per_s = vertical_damping_per_s
 
+    def _params(self) -> Tuple[float, ...]:
+        return (
+            self.mass_kg,
+            self.max_thrust_accel_mps2,
+            self.air_density_kgpm3,
+            self.drag_coeff,
+            self.frontal_area_m2,
+            self.lift_k_per_mass,
+            self.gravity_mps2,
+            self.vertical_damping_per_s,
+        )
+
     def step(
         self,
         state: AircraftState,
@@ -54,65 +207,54 @@ class SimpleAircraft2D:
         env: Environment,
         dt_s: float,
     ) -> AircraftState:
-        # Clamp inputs
-        thrust = max(0.0, min(1.0, control.thrust_01))
-        pitch_rad = math.radians(control.pitch_deg)
-
-        # Thrust components (acceleration per mass)
-        thrust_ax = self.max_thrust_accel_mps2 * thrust * math.cos(pitch_rad)
-        thrust_ay = self.max_thrust_accel_mps2 * thrust * math.sin(pitch_rad)
-
-        # Air-relative velocity
-        rel_vx = state.vel_x_mps - env.wind_x_mps
-        rel_vy = state.vel_y_mps
-        speed = math.hypot(rel_vx, rel_vy)
-
-        # Drag: D = 0.5 * rho * Cd * A * v^2, direction opposite airspeed
-        if speed > 0.0:
-            drag_acc_mag = 0.5 * self.air_density_kgpm3 * self.drag_coeff * self.frontal_area_m2 * (speed * speed) / self.mass_kg
-            drag_acc_mag = min(drag_acc_mag, 50.0)
-            ux = rel_vx / speed
-            uy = rel_vy / speed
-            drag_ax = -drag_acc_mag * ux
-            drag_ay = -drag_acc_mag * uy
-        else:
-            drag_ax = 0.0
-            drag_ay = 0.0
-
-        # Lift: L = kL * v^2 * max(sin(alpha), 0) upward only (alpha ≈ pitch)
-        lift_acc = self.lift_k_per_mass * (speed * speed) * max(math.sin(pitch_rad), 0.0)
-        lift_acc = min(lift_acc, 20.0)
-        lift_ax = 0.0
-        lift_ay = lift_acc
-
-        # Gravity
-        grav_ax = 0.0
-        grav_ay = -self.gravity_mps2
-
-        # Net acceleration
-        ax = thrust_ax + drag_ax + lift_ax + grav_ax
-        # Simple vertical damping to bleed climb/descent energy in the toy model
-        damping_ay = -self.vertical_damping_per_s * state.vel_y_mps
-        ay = thrust_ay + drag_ay + lift_ay + grav_ay + damping_ay
-
-        # Integrate (explicit Euler)
-        new_vx = state.vel_x_mps + ax * dt_s
-        new_vy = state.vel_y_mps + ay * dt_s
-        # Cap speeds to avoid numerical blow-up in toy model
-        new_vx = max(-300.0, min(300.0, new_vx))
-        new_vy = max(-300.0, min(300.0, new_vy))
-        new_x = state.pos_x_m + state.vel_x_mps * dt_s
-        new_y = max(0.0, state.pos_y_m + state.vel_y_mps * dt_s)
-
+        time_s, pos_x_m, pos_y_m, vel_x_mps, vel_y_mps = _step_core(
+            state.time_s,
+            state.pos_x_m,
+            state.pos_y_m,
+            state.vel_x_mps,
+            state.vel_y_mps,
+            control.thrust_01,
+            *_pitch_trig(control.pitch_deg),
+            env.wind_x_mps,
+            dt_s,
+            *self._params(),
+        )
         return AircraftState(
-            time_s=state.time_s + dt_s,
-            pos_x_m=new_x,
-            pos_y_m=new_y,
-            vel_x_mps=new_vx,
-            vel_y_mps=new_vy,
+            time_s=time_s,
+            pos_x_m=pos_x_m,
+            pos_y_m=pos_y_m,
+            vel_x_mps=vel_x_mps,
+            vel_y_mps=vel_y_mps,
             pitch_deg=control.pitch_deg,
         )
 
+    def simulate(
+        self,
+        state: AircraftState,
+        thrust_01: np.ndarray,
+        pitch_deg: np.ndarray,
+        wind_x_mps: np.ndarray,
+        dt_s: float,
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Integrate a whole control schedule; equivalent to calling step() per element.
+
+        Returns (time_s, pos_x_m, pos_y_m, vel_x_mps, vel_y_mps) arrays, one entry per tick.
+        """
+        pitch_rad = np.radians(np.asarray(pitch_deg, dtype=np.float64))
+        return _simulate_core(
+            np.ascontiguousarray(thrust_01, dtype=np.float64),
+            np.ascontiguousarray(np.sin(pitch_rad)),
+            np.ascontiguousarray(np.cos(pitch_rad)),
+            np.ascontiguousarray(wind_x_mps, dtype=np.float64),
+            float(state.time_s),
+            float(state.pos_x_m),
+            float(state.pos_y_m),
+            float(state.vel_x_mps),
+            float(state.vel_y_mps),
+            float(dt_s),
+            *self._params(),
+        )
+
 
 def initial_state() -> AircraftState:
     return AircraftState(time_s=0.0, pos_x_m=0.0, pos_y_m=0.0, vel_x_mps=0.0, vel_y_mps=0.0, pitch_deg=0.0)
@@ -1,13 +1,121 @@
 from __future__ import annotations
 
-import json
-import queue
+import collections
+import ctypes
+import ctypes.util
+import errno
+import logging
 import random
+import selectors
 import socket
+import struct
+import sys
 import threading
 import time
 from dataclasses import dataclass
-from typing import Optional, Tuple
+from typing import Callable, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Control frame on the wire: little-endian (thrust_01, pitch_deg) as float64
+CONTROL_FRAME = struct.Struct("<dd")
+
+
+# Linux batch datagram syscalls (sendmmsg/recvmmsg) through ctypes; None elsewhere
+class _IoVec(ctypes.Structure):
+    _fields_ = [("iov_base", ctypes.c_void_p), ("iov_len", ctypes.c_size_t)]
+
+
+class _MsgHdr(ctypes.Structure):
+    _fields_ = [
+        ("msg_name", ctypes.c_void_p),
+        ("msg_namelen", ctypes.c_uint32),
+        ("msg_iov", ctypes.POINTER(_IoVec)),
+        ("msg_iovlen", ctypes.c_size_t),
+        ("msg_control", ctypes.c_void_p),
+        ("msg_controllen", ctypes.c_size_t),
+        ("msg_flags", ctypes.c_int),
+    ]
+
+
+class _MMsgHdr(ctypes.Structure):
+    _fields_ = [("msg_hdr", _MsgHdr), ("msg_len", ctypes.c_uint)]
+
+
+def _load_libc() -> Optional[ctypes.CDLL]:
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+    except OSError:
+        return None
+    if not (hasattr(libc, "sendmmsg") and hasattr(libc, "recvmmsg")):
+        return None
+    return libc
+
+
+_libc = _load_libc()
+
+
+def _mmsg_array(bufs: Sequence[ctypes.Array], lengths: Sequence[int]) -> Tuple[ctypes.Array, ctypes.Array]:
+    n = len(bufs)
+    iovs = (_IoVec * n)()
+    msgs = (_MMsgHdr * n)()
+    for i, (buf, length) in enumerate(zip(bufs, lengths)):
+        iovs[i].iov_base = ctypes.addressof(buf)
+        iovs[i].iov_len = length
+        msgs[i].msg_hdr.msg_iov = ctypes.pointer(iovs[i])
+        msgs[i].msg_hdr.msg_iovlen = 1
+    # Return iovs too: the msghdrs only hold raw pointers into it
+    return msgs, iovs
+
+
+def _sendmmsg(fd: int, frames: Sequence[bytes]) -> int:
+    """Send datagrams on a connected socket with as few sendmmsg(2) calls as possible.
+
+    A frame the kernel refuses is skipped, like a lost datagram, and sending
+    resumes with the next one. Returns the number of frames actually sent.
+    """
+    bufs = [ctypes.create_string_buffer(f, len(f)) for f in frames]
+    msgs, _iovs = _mmsg_array(bufs, [len(f) for f in frames])
+    sent = 0
+    pos = 0
+    while pos < len(frames):
+        rc = _libc.sendmmsg(fd, ctypes.byref(msgs, pos * ctypes.sizeof(_MMsgHdr)), len(frames) - pos, 0)
+        if rc <= 0:
+            # sendmmsg fails only on the first frame of a call: drop that one
+            pos += 1
+            continue
+        sent += rc
+        pos += rc
+    return sent
+
+
+class _RecvBatch:
+    """Preallocated buffers for draining a socket with recvmmsg(2)."""
+
+    def __init__(self, count: int = 32, size: int = 64) -> None:
+        self._bufs = [ctypes.create_string_buffer(size) for _ in range(count)]
+        self._msgs, self._iovs = _mmsg_array(self._bufs, [size] * count)
+
+    def drain(self, fd: int) -> list[bytes]:
+        """Return every datagram currently queued on fd without blocking."""
+        frames: list[bytes] = []
+        count = len(self._bufs)
+        while True:
+            rc = _libc.recvmmsg(fd, self._msgs, count, socket.MSG_DONTWAIT, None)
+            if rc < 0:
+                err = ctypes.get_errno()
+                if err in (errno.EAGAIN, errno.EWOULDBLOCK):
+                    return frames
+                raise OSError(err, "recvmmsg failed")
+            for i in range(rc):
+                # A datagram longer than the buffer is cut short; never pass on a partial one
+                if self._msgs[i].msg_hdr.msg_flags & socket.MSG_TRUNC:
+                    continue
+                frames.append(self._bufs[i][: self._msgs[i].msg_len])
+            if rc < count:
+                return frames
 
 
 @dataclass
@@ -19,16 +127,50 @@ class RpcConfig:
     rand_seed: int = 0
 
 
+class ManualClock:
+    """Clock advanced explicitly by the caller, so RPC latency can run on simulated time.
+
+    The unit is up to the caller (run_sim counts ticks); pass UdpServer a latency in the same unit.
+    """
+
+    def __init__(self, now: float = 0.0) -> None:
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
 class UdpServer:
-    def __init__(self, config: RpcConfig) -> None:
+    def __init__(
+        self,
+        config: RpcConfig,
+        clock: Callable[[], float] = time.monotonic,
+        latency: Optional[float] = None,
+    ) -> None:
         self.config = config
+        # Time source for latency: stamps arrivals and is the default for poll_next
+        self.clock = clock
+        # Delay in clock units; defaults to config.latency_ms in seconds
+        if latency is None:
+            latency = float(config.latency_ms) / 1000.0
+        self.latency = max(0.0, float(latency))
         self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
         self.sock.bind((config.host, config.port))
         self.address = self.sock.getsockname()
         self._rx_thread = threading.Thread(target=self._rx_loop, daemon=True)
         self._stop = threading.Event()
-        # Queue of (apply_time_s, dict)
-        self._pending: "queue.PriorityQueue[Tuple[float, dict]]" = queue.PriorityQueue()
+        # Self-pipe (a socketpair, so it is selectable on every platform) that
+        # stop() writes to in order to interrupt the RX thread's select()
+        self._wake_r, self._wake_w = socket.socketpair()
+        # FIFO of (apply_time_s, dict). Latency is fixed, so apply times are already
+        # non-decreasing in arrival order and the head is always the next due message.
+        self._pending: "collections.deque[Tuple[float, dict]]" = collections.deque()
+        self._lock = threading.Lock()
+        # Datagrams taken off the socket so far, including dropped ones
+        self._received = 0
+        self._received_cv = threading.Condition(self._lock)
+        # Set if the RX thread died; no further datagrams will arrive
+        self._rx_error: Optional[OSError] = None
         self._rand = random.Random(int(config.rand_seed))
 
     def start(self) -> None:
@@ -37,56 +179,158 @@ class UdpServer:
     def stop(self) -> None:
         self._stop.set()
         try:
-            self.sock.close()
-        except Exception:
+            # Wake the selector so the RX thread exits without waiting out its timeout
+            self._wake_w.send(b"\0")
+        except OSError:
             pass
-        self._rx_thread.join(timeout=1.0)
+        if self._rx_thread.is_alive():
+            self._rx_thread.join(timeout=1.0)
+        for sock in (self.sock, self._wake_r, self._wake_w):
+            try:
+                sock.close()
+            except Exception:
+                pass
 
     def _rx_loop(self) -> None:
-        self.sock.settimeout(0.2)
-        while not self._stop.is_set():
+        self.sock.setblocking(False)
+        batch = _RecvBatch() if _libc is not None else None
+        with selectors.DefaultSelector() as sel:
+            sel.register(self.sock, selectors.EVENT_READ)
+            sel.register(self._wake_r, selectors.EVENT_READ)
+            while not self._stop.is_set():
+                for key, _events in sel.select(timeout=0.05):
+                    if key.fileobj is not self.sock:
+                        continue
+                    try:
+                        frames = self._drain(batch)
+                    except OSError as exc:
+                        if not self._stop.is_set():
+                            logger.error("UDP receive failed, RX thread exiting: %s", exc)
+                        # Wake wait_received() callers instead of letting them time out
+                        with self._received_cv:
+                            self._rx_error = exc
+                            self._received_cv.notify_all()
+                        return
+                    if frames:
+                        self._enqueue(frames)
+
+    def _drain(self, batch: Optional[_RecvBatch]) -> list[bytes]:
+        # Socket is non-blocking: read everything queued, then return
+        if batch is not None:
+            return batch.drain(self.sock.fileno())
+        frames = []
+        while True:
             try:
                 data, _peer = self.sock.recvfrom(4096)
-            except socket.timeout:
-                continue
-            except OSError:
-                break
+            except BlockingIOError:
+                return frames
+            frames.append(data)
+
+    def _enqueue(self, frames: list[bytes]) -> None:
+        apply_time = self.clock() + self.latency
+        ready = []
+        for data in frames:
             try:
-                msg = json.loads(data.decode("utf-8"))
-                # Packet loss
-                if self._rand.random() < float(self.config.loss_p):
-                    continue
-                latency_s = max(0.0, float(self.config.latency_ms) / 1000.0)
-                apply_time = time.monotonic() + latency_s
-                self._pending.put((apply_time, msg))
-            except Exception:
-                # Drop malformed
+                thrust_01, pitch_deg = CONTROL_FRAME.unpack(data)
+            except struct.error:
+                # Drop malformed (anything that is not exactly one frame)
                 continue
+            # Packet loss
+            if self._rand.random() < float(self.config.loss_p):
+                continue
+            ready.append((apply_time, {"thrust_01": thrust_01, "pitch_deg": pitch_deg}))
+        with self._received_cv:
+            self._pending.extend(ready)
+            self._received += len(frames)
+            self._received_cv.notify_all()
+
+    def wait_received(self, count: int, timeout_s: float = 1.0) -> bool:
+        """Block until at least count datagrams have been taken off the socket.
+
+        Returns False on timeout, or straight away if the RX thread has died.
+        """
+        with self._received_cv:
+            self._received_cv.wait_for(lambda: self._received >= count or self._rx_error is not None, timeout_s)
+            return self._received >= count
 
     def poll_next(self, now_s: Optional[float] = None) -> Optional[dict]:
-        now = time.monotonic() if now_s is None else now_s
-        try:
-            while True:
-                apply_time, msg = self._pending.get_nowait()
-                if apply_time <= now:
-                    return msg
-                else:
-                    # Not ready yet, put back and exit
-                    self._pending.put((apply_time, msg))
-                    return None
-        except queue.Empty:
-            return None
+        now = self.clock() if now_s is None else now_s
+        with self._lock:
+            if self._pending and self._pending[0][0] <= now:
+                return self._pending.popleft()[1]
+        return None
+
+
+class DirectChannel:
+    """In-process control link with no loss or latency.
+
+    Stands in for a UdpServer/UdpClient pair (same send/flush/poll_next calls)
+    when there are no network effects to emulate, skipping the socket round trip,
+    frame encoding and RX thread.
+    """
+
+    def __init__(self) -> None:
+        self._pending: "collections.deque[dict]" = collections.deque()
+        self.sent = 0
+
+    def send(self, thrust_01: float, pitch_deg: float) -> None:
+        self._pending.append({"thrust_01": float(thrust_01), "pitch_deg": float(pitch_deg)})
+        self.sent += 1
+
+    def flush(self) -> None:
+        pass
+
+    def wait_received(self, count: int, timeout_s: float = 1.0) -> bool:
+        return True
+
+    def poll_next(self, now_s: Optional[float] = None) -> Optional[dict]:
+        return self._pending.popleft() if self._pending else None
+
+    def stop(self) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
 
 
 class UdpClient:
-    def __init__(self, server_addr: Tuple[str, int]) -> None:
+    def __init__(self, server_addr: Tuple[str, int], batch_size: int = 1) -> None:
         self.server_addr = server_addr
         self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        # Connected so batched sends need no per-message address
+        self.sock.connect(server_addr)
+        # Frames are queued until batch_size is reached or flush() is called
+        self.batch_size = max(1, int(batch_size))
+        self._pending_msgs: list[bytes] = []
+        # Frames the kernel accepted so far (what the server can expect to receive)
+        self.sent = 0
 
     def send(self, thrust_01: float, pitch_deg: float) -> None:
-        msg = json.dumps({"thrust_01": float(thrust_01), "pitch_deg": float(pitch_deg)})
+        self._pending_msgs.append(CONTROL_FRAME.pack(float(thrust_01), float(pitch_deg)))
+        if len(self._pending_msgs) >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        # Fire-and-forget on every path: a frame that fails to send is dropped
+        # like a lost datagram and only successful sends are counted
+        frames = self._pending_msgs
+        if not frames:
+            return
+        self._pending_msgs = []
+        if _libc is not None and len(frames) > 1:
+            self.sent += _sendmmsg(self.sock.fileno(), frames)
+            return
+        for frame in frames:
+            try:
+                self.sock.send(frame)
+            except OSError:
+                continue
+            self.sent += 1
+
+    def close(self) -> None:
+        # Never raises, so callers can close from a finally without masking an error
+        self.flush()
         try:
-            self.sock.sendto(msg.encode("utf-8"), self.server_addr)
-        except Exception:
+            self.sock.close()
+        except OSError:
             pass
-
@@ -1,36 +1,126 @@
 from __future__ import annotations
 
 from typing import Callable, Tuple
+import math
 import numpy as np
 
+from ._jit import njit
+from .physics import AircraftState, SimpleAircraft2D, _step_core
 
-def takeoff_landing(seed: int, wind: float = 0.0) -> Callable[[float], Tuple[float, float, float]]:
-    np.random.default_rng(int(seed))
+
+# fastmath=False is explicit: numba compiles a callee that leaves it unset with
+# the caller's flags, and _deterministic_run (fastmath) would then register an
+# FMA-contracted overload that control_fn picks up as well
+@njit(cache=True, fastmath=False)
+def _takeoff_landing_schedule(t_s: float) -> Tuple[float, float]:
     # Deterministic schedule: roll ~0-3.5s, rotate to ~10° for climb until ~8s,
     # then approach from ~12s with reduced thrust and pitch back toward 0°.
+    if t_s < 3.5:
+        # Roll: ramp thrust to takeoff power, keep pitch near 0°
+        thrust = 0.25 + 0.65 * (t_s / 3.5)  # ≈0.25 → 0.9 by 3.5s
+        pitch = 0.0
+    elif t_s < 8.0:
+        # Rotate and initial climb
+        thrust = 0.85
+        pitch = 10.0  # between 8–12°; choose 10°
+    elif t_s < 12.0:
+        # Climb/cruise segment
+        thrust = 0.7
+        pitch = 4.0
+    else:
+        # Approach: idle thrust with strong nose-down to ensure descent
+        thrust = 0.0
+        pitch = -20.0
+    return thrust, pitch
+
+
+def takeoff_landing(seed: int, wind: float = 0.0) -> Callable[[float], Tuple[float, float, float]]:
+    np.random.default_rng(int(seed))
     def control_fn(t_s: float) -> Tuple[float, float, float]:
-        # Baseline wind kept constant (default 0.0) for determinism
-        if t_s < 3.5:
-            # Roll: ramp thrust to takeoff power, keep pitch near 0°
-            thrust = 0.25 + 0.65 * (t_s / 3.5)  # ≈0.25 → 0.9 by 3.5s
-            pitch = 0.0
-        elif t_s < 8.0:
-            # Rotate and initial climb
-            thrust = 0.85
-            pitch = 10.0  # between 8–12°; choose 10°
-        elif t_s < 12.0:
-            # Climb/cruise segment
-            thrust = 0.7
-            pitch = 4.0
-        else:
-            # Approach: idle thrust with strong nose-down to ensure descent
-            thrust = 0.0
-            pitch = -20.0
+        # Baseline wind kept constant (default 0.0) for determinism. Calls the
+        # compiled schedule directly, like step() calls _step_core
+        thrust, pitch = _takeoff_landing_schedule(float(t_s))
         return float(thrust), float(pitch), float(wind)
 
     return control_fn
 
 
+@njit(cache=True, fastmath=True)
+def _deterministic_run(
+    steps: int,
+    dt: float,
+    wind: float,
+    time_s: float,
+    px: float,
+    py: float,
+    vx: float,
+    vy: float,
+    mass: float,
+    max_thr: float,
+    rho: float,
+    cd: float,
+    area: float,
+    lift_k: float,
+    g: float,
+    vdamp: float,
+) -> np.ndarray:
+    # Schedule, physics and telemetry rows fused into one loop (ideal control link)
+    out = np.empty((steps, 8))
+    last_pitch = 0.0
+    sin_pitch = 0.0
+    cos_pitch = 1.0
+    for i in range(steps):
+        thrust, pitch = _takeoff_landing_schedule(i * dt)
+        if i == 0 or pitch != last_pitch:
+            pitch_rad = math.radians(pitch)
+            sin_pitch = math.sin(pitch_rad)
+            cos_pitch = math.cos(pitch_rad)
+            last_pitch = pitch
+        time_s, px, py, vx, vy = _step_core(
+            time_s, px, py, vx, vy, thrust, sin_pitch, cos_pitch, wind, dt,
+            mass, max_thr, rho, cd, area, lift_k, g, vdamp,
+        )
+        out[i, 0] = time_s
+        out[i, 1] = px
+        out[i, 2] = py
+        out[i, 3] = vx
+        out[i, 4] = vy
+        out[i, 5] = thrust
+        out[i, 6] = pitch
+        out[i, 7] = wind
+    return out
+
+
+def takeoff_landing_run(
+    sim: SimpleAircraft2D, state: AircraftState, steps: int, dt_s: float, wind: float = 0.0
+) -> np.ndarray:
+    """Run takeoff_landing with every command applied on its own tick.
+
+    Returns a (steps, 8) array whose columns follow telemetry.TELEMETRY_COLUMNS.
+    """
+    return _deterministic_run(
+        int(steps),
+        float(dt_s),
+        float(wind),
+        float(state.time_s),
+        float(state.pos_x_m),
+        float(state.pos_y_m),
+        float(state.vel_x_mps),
+        float(state.vel_y_mps),
+        *sim._params(),
+    )
+
+
+def takeoff_landing_vectorized(t_s: np.ndarray, wind: float = 0.0) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    # Same schedule as takeoff_landing's control_fn, evaluated over a whole time array.
+    # np.select takes the first matching condition, mirroring the if/elif chain.
+    t_s = np.asarray(t_s, dtype=np.float64)
+    segments = [t_s < 3.5, t_s < 8.0, t_s < 12.0]
+    thrust = np.select(segments, [0.25 + 0.65 * (t_s / 3.5), 0.85, 0.7], default=0.0)
+    pitch = np.select(segments, [0.0, 10.0, 4.0], default=-20.0)
+    return thrust, pitch, np.full_like(t_s, float(wind))
+
+
 def wind_gusts(seed: int, gust_std: float) -> Callable[[float], Tuple[float, float, float]]:
     rng = np.random.default_rng(int(seed))
     def control_fn(t_s: float) -> Tuple[float, float, float]:
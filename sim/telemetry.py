@@ -2,11 +2,26 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from typing import Optional, Dict, Any, Tuple
+import hashlib
 import os
+import warnings
 import numpy as np
 import pandas as pd
 
 
+# Column order of run_sim telemetry
+TELEMETRY_COLUMNS = [
+    "time_s",
+    "pos_x_m",
+    "pos_y_m",
+    "vel_x_mps",
+    "vel_y_mps",
+    "thrust_01",
+    "pitch_deg",
+    "wind_x_mps",
+]
+
+
 @dataclass
 class TelemetryConfig:
     hz: int
@@ -15,51 +30,186 @@ class TelemetryConfig:
 
 
 class TelemetryRecorder:
-    def __init__(self, config: TelemetryConfig) -> None:
+    def __init__(self, config: TelemetryConfig, capacity: int = 1024) -> None:
         self.config = config
         self.dt_s = 1.0 / float(config.hz)
-        self._rows: list[Dict[str, Any]] = []
+        # Columnar float64 buffers, one per field in first-seen order; rows [0, _n) are valid
+        self._cols: Dict[str, np.ndarray] = {}
+        self._cap = max(1, int(capacity))
+        self._n = 0
         self._rng = np.random.default_rng(config.rng_seed) if config.rng_seed is not None else None
+        # GPS jitter is drawn lazily at finalize time; _noise caches the (x, y) draws
+        # so repeated exports of the same rows see the same jitter
+        self._jitter_enabled = self._rng is not None and config.gps_jitter_std_m > 0.0
+        self._noise = np.empty((0, 2))
+
+    def _reserve(self, extra: int) -> None:
+        need = self._n + extra
+        if need <= self._cap:
+            return
+        cap = max(2 * self._cap, need)
+        for name, buf in self._cols.items():
+            grown = np.full(cap, np.nan)
+            grown[: self._n] = buf[: self._n]
+            self._cols[name] = grown
+        self._cap = cap
+
+    def _column(self, name: str) -> np.ndarray:
+        buf = self._cols.get(name)
+        if buf is None:
+            # Fields missing from earlier rows read back as NaN
+            buf = self._cols[name] = np.full(self._cap, np.nan)
+        return buf
 
     def record(self, row: Dict[str, Any]) -> None:
+        self._reserve(1)
+        i = self._n
+        for name, value in row.items():
+            self._column(name)[i] = value
+        self._n += 1
+
+    def record_columns(self, columns: Dict[str, np.ndarray]) -> None:
+        """Record a block of rows given as equal-length column arrays."""
+        n = len(next(iter(columns.values()), ()))
+        self._reserve(n)
+        i = self._n
+        for name, values in columns.items():
+            self._column(name)[i : i + n] = values
+        self._n += n
+
+    def _position_noise(self) -> np.ndarray:
+        missing = self._n - self._noise.shape[0]
+        if missing > 0:
+            # One (x, y) pair per row, in row order: the same stream per-row draws produced
+            extra = self._rng.normal(0.0, self.config.gps_jitter_std_m, size=(missing, 2))
+            self._noise = np.concatenate([self._noise, extra])
+        return self._noise[: self._n]
+
+    def _export_columns(self) -> Dict[str, np.ndarray]:
+        cols = {name: buf[: self._n] for name, buf in self._cols.items()}
         # Apply GPS jitter only to position fields if configured
-        if self._rng is not None and self.config.gps_jitter_std_m > 0.0:
-            if "pos_x_m" in row:
-                row = dict(row)
-                row["pos_x_m"] = float(row["pos_x_m"]) + float(self._rng.normal(0.0, self.config.gps_jitter_std_m))
-            if "pos_y_m" in row:
-                row = dict(row)
-                row["pos_y_m"] = float(row["pos_y_m"]) + float(self._rng.normal(0.0, self.config.gps_jitter_std_m))
-        self._rows.append(row)
+        if self._jitter_enabled and self._n:
+            noise = self._position_noise()
+            if "pos_x_m" in cols:
+                cols["pos_x_m"] = cols["pos_x_m"] + noise[:, 0]
+            if "pos_y_m" in cols:
+                cols["pos_y_m"] = cols["pos_y_m"] + noise[:, 1]
+        return cols
 
     def to_dataframe(self) -> pd.DataFrame:
-        if not self._rows:
+        if self._n == 0:
             return pd.DataFrame()
-        return pd.DataFrame(self._rows)
+        return pd.DataFrame(self._export_columns(), copy=False)
 
     def save_csv(self, path: str) -> None:
         os.makedirs(os.path.dirname(path), exist_ok=True)
-        df = self.to_dataframe()
-        if not df.empty:
+        cols = self._export_columns()
+        names = list(cols)
+        data = np.column_stack(list(cols.values())) if names else np.empty((0, 0))
+        if self._n:
             # Append checksum row as a cheap determinism guard: sums of numeric columns
-            sums = {}
-            for col in df.columns:
-                if pd.api.types.is_numeric_dtype(df[col]):
-                    sums[col] = float(np.nan_to_num(df[col]).sum())
-                else:
-                    sums[col] = df[col].iloc[-1]
+            sums = np.nan_to_num(data).sum(axis=0)
             # Use time_s = -1.0 to mark checksum row
-            if "time_s" in sums:
-                sums["time_s"] = -1.0
-            df = pd.concat([df, pd.DataFrame([sums])], ignore_index=True)
-        df.to_csv(path, index=False)
+            if "time_s" in names:
+                sums[names.index("time_s")] = -1.0
+            data = np.vstack([data, sums])
+        # All fields are float64; %.17g round-trips every value exactly
+        np.savetxt(path, data, fmt="%.17g", delimiter=",", header=",".join(names), comments="")
+
+
+def _read_numeric_csv(path: str) -> Optional[Tuple[list[str], np.ndarray]]:
+    """Load an all-numeric CSV as (header, rows x columns float64); None if any field is not numeric."""
+    with open(path) as f:
+        header = f.readline().strip()
+        names = header.split(",") if header else []
+        try:
+            with warnings.catch_warnings():
+                # Header-only files are valid (bootstrap goldens)
+                warnings.simplefilter("ignore", UserWarning)
+                data = np.loadtxt(f, delimiter=",", dtype=np.float64, ndmin=2)
+        except ValueError:
+            return None
+    if data.size == 0:
+        data = np.empty((0, len(names)))
+    return names, data
+
+
+def golden_npy_path(csv_path: str) -> str:
+    return os.path.splitext(csv_path)[0] + ".npy"
+
+
+def _file_sha256(path: str) -> bytes:
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest().encode("ascii")
+
+
+def write_golden_npy(csv_path: str) -> str:
+    """Write a binary copy of a numeric golden CSV next to it; returns the .npy path.
+
+    Stored as one record holding the SHA-256 of the CSV bytes and the rows as a
+    structured float64 array, so the column names travel with the data and the
+    copy can be checked against the CSV it was made from.
+    """
+    loaded = _read_numeric_csv(csv_path)
+    if loaded is None:
+        raise ValueError(f"Golden has non-numeric fields: {csv_path}")
+    names, data = loaded
+    row_dtype = np.dtype([(name, np.float64) for name in names])
+    rec = np.zeros((), dtype=[("csv_sha256", "S64"), ("rows", row_dtype, (data.shape[0],))])
+    rec["csv_sha256"] = _file_sha256(csv_path)
+    for j, name in enumerate(names):
+        rec["rows"][name] = data[:, j]
+    out = golden_npy_path(csv_path)
+    np.save(out, rec, allow_pickle=False)
+    return out
+
+
+def _read_golden(path: str) -> Optional[Tuple[list[str], np.ndarray]]:
+    # Prefer the binary copy, but only if it was made from exactly this CSV content;
+    # otherwise (missing, stale or unreadable) parse the CSV
+    npy = golden_npy_path(path)
+    if os.path.exists(npy):
+        try:
+            rec = np.load(npy, allow_pickle=False)
+            fresh = rec.dtype.names == ("csv_sha256", "rows") and rec["csv_sha256"] == _file_sha256(path)
+        except (OSError, ValueError, EOFError):
+            fresh = False
+        if fresh:
+            rows = rec["rows"]
+            names = list(rows.dtype.names or ())
+            if rows.shape[0] == 0:
+                return names, np.empty((0, len(names)))
+            return names, np.column_stack([rows[name] for name in names])
+    return _read_numeric_csv(path)
 
 
 def compare_csvs(golden_path: str, run_path: str, atol: float = 1e-3, per_column_atol: Optional[Dict[str, float]] = None) -> Tuple[bool, str]:
     if not os.path.exists(golden_path):
         return False, f"Golden missing: {golden_path}"
-    golden = pd.read_csv(golden_path)
-    run = pd.read_csv(run_path)
+    golden = _read_golden(golden_path)
+    run = _read_numeric_csv(run_path)
+    if golden is None or run is None:
+        return _compare_frames(pd.read_csv(golden_path), pd.read_csv(run_path), atol, per_column_atol)
+    (golden_cols, g), (run_cols, r) = golden, run
+    # If golden is empty, treat as placeholder and pass with warning
+    if g.shape[0] == 0:
+        return True, "Golden empty: placeholder accepted"
+    if golden_cols != run_cols:
+        return False, "Column mismatch"
+    if g.shape[0] != r.shape[0]:
+        return False, f"Row count mismatch: golden={g.shape[0]} run={r.shape[0]}"
+    # One pass over the whole matrix; same acceptance as np.allclose(atol=..., rtol=0, equal_nan=True)
+    atol_vec = np.array([per_column_atol.get(col, atol) if per_column_atol else atol for col in golden_cols])
+    with np.errstate(invalid="ignore"):
+        close = (np.abs(g - r) <= atol_vec) | (g == r) | (np.isnan(g) & np.isnan(r))
+    bad = ~close.all(axis=0)
+    if bad.any():
+        return False, f"Deviation in column: {golden_cols[int(np.argmax(bad))]}"
+    return True, "OK"
+
+
+def _compare_frames(golden: pd.DataFrame, run: pd.DataFrame, atol: float, per_column_atol: Optional[Dict[str, float]]) -> Tuple[bool, str]:
+    # Fallback for CSVs with non-numeric fields
     # If golden is empty, treat as placeholder and pass with warning
     if golden.shape[0] == 0:
         return True, "Golden empty: placeholder accepted"
@@ -18,6 +18,8 @@ def test_checksum_row_matches_sums():
         latency_ms=50,
         golden=None,
         out_csv=out_csv,
+        realtime=False,
+        plot=False,
     )
     assert rc == 0
     df = pd.read_csv(out_csv)
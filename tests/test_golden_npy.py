@@ -0,0 +1,73 @@
+import os
+import tempfile
+
+from sim.cli import run_sim
+from sim.telemetry import (
+    TELEMETRY_COLUMNS,
+    compare_csvs,
+    golden_npy_path,
+    write_golden_npy,
+)
+
+
+def test_npy_golden_matches_csv_and_stale_copy_is_ignored():
+    tmpdir = tempfile.mkdtemp()
+    golden = os.path.join(tmpdir, "golden.csv")
+    out_csv = os.path.join(tmpdir, "run.csv")
+    for path, loss_p, latency_ms in ((golden, 0.0, 0), (out_csv, 0.2, 100)):
+        rc = run_sim(
+            scenario="takeoff_landing",
+            seed=123,
+            hz=20,
+            duration_s=10.0,
+            loss_p=loss_p,
+            latency_ms=latency_ms,
+            golden=None,
+            out_csv=path,
+            realtime=False,
+            plot=False,
+        )
+        assert rc == 0
+
+    from_csv = compare_csvs(golden, out_csv, atol=0.05)
+    npy = write_golden_npy(golden)
+    assert npy == golden_npy_path(golden)
+    assert compare_csvs(golden, out_csv, atol=0.05) == from_csv
+    assert compare_csvs(golden, golden) == (True, "OK")
+
+    # CSV regenerated without refreshing the .npy, and the .npy touched last
+    # (as a checkout would): the stale binary copy must not be used
+    with open(out_csv) as src, open(golden, "w") as dst:
+        dst.write(src.read())
+    os.utime(npy)
+    assert os.path.getmtime(npy) >= os.path.getmtime(golden)
+    assert compare_csvs(golden, out_csv) == (True, "OK")
+
+    # A .npy of the header-only placeholder, left behind after the CSV gained
+    # real rows, must not turn a failing compare into "placeholder accepted"
+    with open(golden, "w") as dst:
+        dst.write(",".join(TELEMETRY_COLUMNS) + "\n")
+    write_golden_npy(golden)
+    rc = run_sim(
+        scenario="takeoff_landing",
+        seed=123,
+        hz=20,
+        duration_s=10.0,
+        loss_p=0.0,
+        latency_ms=0,
+        golden=None,
+        out_csv=golden,
+        realtime=False,
+        plot=False,
+    )
+    assert rc == 0
+    os.utime(npy)
+    assert compare_csvs(golden, out_csv, atol=0.05) == from_csv
+
+    # An empty or partly written .npy is unreadable: fall back to the CSV
+    with open(npy, "rb") as f:
+        data = f.read()
+    for broken in (b"", data[: len(data) // 2], data[:-1]):
+        with open(npy, "wb") as f:
+            f.write(broken)
+        assert compare_csvs(golden, out_csv, atol=0.05) == from_csv
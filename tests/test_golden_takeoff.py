@@ -18,6 +18,8 @@ def test_takeoff_golden_comparison():
         latency_ms=0,
         golden=None,
         out_csv=out_csv,
+        realtime=False,
+        plot=False,
     )
     assert rc == 0
     ok, reason = compare_csvs(
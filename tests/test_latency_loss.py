@@ -1,8 +1,10 @@
 import os
 import tempfile
 
+from sim import scenarios
 from sim.cli import run_sim
 from sim.telemetry import compare_csvs
+import numpy as np
 import pandas as pd
 
 
@@ -19,6 +21,8 @@ def test_latency_and_loss_complete():
         latency_ms=100,
         golden=None,
         out_csv=out_csv,
+        realtime=False,
+        plot=False,
     )
     assert rc == 0
     ok, reason = compare_csvs(golden, out_csv, atol=1.0)
@@ -38,6 +42,8 @@ def test_no_control_starvation_with_loss():
         latency_ms=120,
         golden=None,
         out_csv=out_csv,
+        realtime=False,
+        plot=False,
     )
     assert rc == 0
     df = pd.read_csv(out_csv)
@@ -47,3 +53,29 @@ def test_no_control_starvation_with_loss():
     frac_zero = zeros / max(1, len(steady))
     assert frac_zero < 0.25
 
+
+def test_latency_lags_by_whole_ticks():
+    tmpdir = tempfile.mkdtemp()
+    out_csv = os.path.join(tmpdir, "run.csv")
+    hz = 20
+    latency_ms = 100
+    rc = run_sim(
+        scenario="takeoff_landing",
+        seed=123,
+        hz=hz,
+        duration_s=15.0,
+        loss_p=0.0,
+        latency_ms=latency_ms,
+        golden=None,
+        out_csv=out_csv,
+        realtime=False,
+        plot=False,
+    )
+    assert rc == 0
+    df = pd.read_csv(out_csv)
+    df = df[df["time_s"] >= 0]
+    lag = latency_ms // (1000 // hz)
+    commanded, _pitch, _wind = scenarios.takeoff_landing_vectorized(np.arange(len(df)) / hz)
+    applied = df["thrust_01"].to_numpy()
+    assert np.all(applied[:lag] == 0.0)
+    assert np.allclose(applied[lag:], commanded[:-lag], atol=1e-12, rtol=0.0)
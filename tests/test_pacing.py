@@ -0,0 +1,22 @@
+import time
+
+from sim.pacing import Pacer
+
+
+def test_pacer_holds_average_rate():
+    pacer = Pacer(hz=200)
+    t0 = time.perf_counter()
+    for _ in range(40):
+        pacer.wait()
+    elapsed = time.perf_counter() - t0
+    # 40 ticks at 5 ms; deadlines are absolute so the loop cannot finish early
+    assert elapsed >= 0.2 - 1e-3
+    assert elapsed < 0.5
+
+
+def test_pacer_skips_frames_after_overrun():
+    pacer = Pacer(hz=100)
+    time.sleep(0.035)
+    assert pacer.wait() >= 2
+    # Deadlines were moved past the overrun, so the next tick is on schedule again
+    assert pacer.wait() == 0
@@ -0,0 +1,138 @@
+import json
+import socket
+import threading
+import time
+
+import pytest
+
+from sim import rpc, scenarios
+from sim.cli import run_sim
+from sim.rpc import CONTROL_FRAME, RpcConfig, UdpServer, UdpClient
+
+
+def _drain(server, expected, timeout_s=2.0):
+    got = []
+    deadline = time.monotonic() + timeout_s
+    while len(got) < expected and time.monotonic() < deadline:
+        msg = server.poll_next()
+        if msg is None:
+            time.sleep(0.001)
+        else:
+            got.append(msg)
+    return got
+
+
+def test_batched_client_delivers_all_frames_in_order():
+    server = UdpServer(RpcConfig())
+    server.start()
+    client = UdpClient(server.address, batch_size=8)
+    for i in range(20):
+        client.send(i / 20.0, float(i))
+    client.flush()
+    got = _drain(server, 20)
+    server.stop()
+    assert [m["pitch_deg"] for m in got] == [float(i) for i in range(20)]
+    assert [m["thrust_01"] for m in got] == [i / 20.0 for i in range(20)]
+
+
+def test_latency_holds_messages_and_keeps_order():
+    server = UdpServer(RpcConfig(latency_ms=50))
+    server.start()
+    client = UdpClient(server.address)
+    for i in range(50):
+        client.send(0.5, float(i))
+    assert server.poll_next() is None
+    time.sleep(0.1)
+    got = _drain(server, 50)
+    server.stop()
+    assert [m["pitch_deg"] for m in got] == [float(i) for i in range(50)]
+
+
+def test_wrong_size_datagrams_are_dropped():
+    server = UdpServer(RpcConfig())
+    server.start()
+    raw = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    bad = [
+        json.dumps({"thrust_01": 0.5, "pitch_deg": 3}).encode(),
+        CONTROL_FRAME.pack(0.5, 3.0)[:8],
+        CONTROL_FRAME.pack(0.5, 3.0) + b"\0",
+        CONTROL_FRAME.pack(0.5, 3.0) * 8,
+    ]
+    for data in bad + [CONTROL_FRAME.pack(0.25, 2.0)]:
+        raw.sendto(data, server.address)
+    raw.close()
+    # The valid frame was sent last, so once it is out nothing else can follow
+    got = _drain(server, 1)
+    assert server.poll_next() is None
+    server.stop()
+    assert got == [{"thrust_01": 0.25, "pitch_deg": 2.0}]
+
+
+@pytest.mark.skipif(rpc._libc is None, reason="recvmmsg is Linux-only")
+def test_recv_batch_skips_truncated_datagrams():
+    rx = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    rx.bind(("127.0.0.1", 0))
+    tx = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    tx.sendto(b"x" * 32, rx.getsockname())
+    tx.sendto(CONTROL_FRAME.pack(0.5, 1.0), rx.getsockname())
+    tx.close()
+    time.sleep(0.05)
+    # Buffers of exactly one frame: the 32-byte datagram arrives truncated to 16
+    frames = rpc._RecvBatch(size=CONTROL_FRAME.size).drain(rx.fileno())
+    rx.close()
+    assert frames == [CONTROL_FRAME.pack(0.5, 1.0)]
+
+
+@pytest.mark.parametrize("batch_size", [1, 4])
+def test_failed_sends_are_dropped_and_not_counted(batch_size):
+    server = UdpServer(RpcConfig())
+    server.start()
+    client = UdpClient(server.address, batch_size=batch_size)
+    client.sock.close()
+    # Fire-and-forget whether or not the frames go out in a batch
+    for i in range(6):
+        client.send(0.5, float(i))
+    client.close()
+    server.stop()
+    assert client.sent == 0
+
+
+def test_dead_rx_thread_fails_wait_immediately(monkeypatch):
+    server = UdpServer(RpcConfig())
+
+    def broken_drain(batch):
+        raise OSError("simulated receive failure")
+
+    monkeypatch.setattr(server, "_drain", broken_drain)
+    server.start()
+    client = UdpClient(server.address)
+    client.send(0.5, 1.0)
+    t0 = time.monotonic()
+    assert server.wait_received(client.sent, timeout_s=5.0) is False
+    assert time.monotonic() - t0 < 1.0
+    server.stop()
+    client.close()
+
+
+def test_run_sim_releases_link_when_scenario_raises(monkeypatch, tmp_path):
+    def broken_scenario(seed, gust_std):
+        def control_fn(t_s):
+            raise ValueError("bad scenario")
+        return control_fn
+
+    monkeypatch.setattr(scenarios, "wind_gusts", broken_scenario)
+    threads_before = threading.active_count()
+    with pytest.raises(ValueError):
+        run_sim(
+            scenario="wind_gusts",
+            seed=1,
+            hz=20,
+            duration_s=1.0,
+            loss_p=0.1,
+            latency_ms=50,
+            golden=None,
+            out_csv=str(tmp_path / "run.csv"),
+            realtime=False,
+            plot=False,
+        )
+    assert threading.active_count() == threads_before
@@ -0,0 +1,34 @@
+import numpy as np
+
+from sim.physics import SimpleAircraft2D, ControlInput, Environment, initial_state
+from sim import scenarios
+
+
+def test_simulate_matches_stepwise():
+    sim = SimpleAircraft2D()
+    dt_s = 1.0 / 20.0
+    t_s = np.arange(300) * dt_s
+    thrust, pitch, wind = scenarios.takeoff_landing_vectorized(t_s, wind=1.5)
+
+    control_fn = scenarios.takeoff_landing(seed=123, wind=1.5)
+    state = initial_state()
+    expected = []
+    for i, t in enumerate(t_s):
+        assert control_fn(t) == (thrust[i], pitch[i], wind[i])
+        state = sim.step(state, ControlInput(thrust_01=thrust[i], pitch_deg=pitch[i]), Environment(wind_x_mps=wind[i]), dt_s)
+        expected.append((state.time_s, state.pos_x_m, state.pos_y_m, state.vel_x_mps, state.vel_y_mps))
+
+    got = np.column_stack(sim.simulate(initial_state(), thrust, pitch, wind, dt_s))
+    assert np.allclose(got, np.array(expected), atol=1e-9, rtol=0.0)
+
+
+def test_fused_takeoff_run_matches_simulate():
+    sim = SimpleAircraft2D()
+    dt_s = 1.0 / 20.0
+    steps = 300
+    thrust, pitch, wind = scenarios.takeoff_landing_vectorized(np.arange(steps) * dt_s, wind=0.0)
+    expected = np.column_stack(sim.simulate(initial_state(), thrust, pitch, wind, dt_s) + (thrust, pitch, wind))
+
+    got = scenarios.takeoff_landing_run(sim, initial_state(), steps, dt_s, wind=0.0)
+    assert got.shape == (steps, 8)
+    assert np.allclose(got, expected, atol=1e-9, rtol=0.0)
@@ -31,6 +31,8 @@ def test_schema_and_profile_takeoff():
         latency_ms=0,
         golden=None,
         out_csv=out_csv,
+        realtime=False,
+        plot=False,
     )
     assert rc == 0
 